@@ -77,6 +77,9 @@ class afc:
         self.buffers    = {}
         self.tool_cmds  = {}
         self.led_obj    = {}
+        self.tmc_sections = None    # Lookup of stepper section name to TMC section name, built when first lane looks up its TMC driver
+        self.rpm_tables = {}        # Assist RPM lookup tables shared between lanes with the same spool geometry
+        self.last_saved_vars = None # Last contents written to var file, used to skip writes when nothing changed
         self.bypass     = None
         self.bypass_last_state = False
         self.message_queue = []
@@ -639,8 +642,12 @@ class afc:
             str["system"]["extruders"][CUR_EXTRUDER.name]={}
             str["system"]["extruders"][CUR_EXTRUDER.name]['lane_loaded'] = CUR_EXTRUDER.lane_loaded
 
+        data = json.dumps(str, indent=4)
+        if data == self.last_saved_vars:
+            return
         with open(self.VarFile+ '.unit', 'w') as f:
-            f.write(json.dumps(str, indent=4))
+            f.write(data)
+        self.last_saved_vars = data
 
     # HUB COMMANDS
     cmd_HUB_LOAD_help = "Load lane into hub"
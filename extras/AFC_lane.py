@@ -412,11 +412,11 @@ class AFCExtruderStepper:
         #  so that nozzle does not sit on print while lane is unloading
         self.AFC.CHANGE_TOOL(change_LANE, restore_pos=False)
         # Change Mapping
-        self.gcode.run_script_from_command('SET_MAP LANE={} MAP={}'.format(change_LANE.name, empty_LANE.map))
+        self.AFC.SPOOL.set_map(change_LANE, empty_LANE.map)
         # Only continue if a error did not happen
         if not self.AFC.error_state:
             # Eject lane from BT
-            self.gcode.run_script_from_command('LANE_UNLOAD LANE={}'.format(empty_LANE.name))
+            self.AFC.LANE_UNLOAD(empty_LANE)
             # Resume pos
             self.AFC.restore_pos()
             # Resume with manual issued command
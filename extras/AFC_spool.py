@@ -69,12 +69,21 @@ class AFCSpool:
             self.logger.info("No LANE Defined")
             return
         map_cmd = gcmd.get('MAP', None)
-        lane_switch=self.AFC.tool_cmds[map_cmd]
-        self.logger.debug("lane to switch is " + lane_switch)
         if lane not in self.AFC.lanes:
             self.logger.info('{} Unknown'.format(lane))
             return
-        CUR_LANE = self.AFC.lanes[lane]
+        self.set_map(self.AFC.lanes[lane], map_cmd)
+
+    def set_map(self, CUR_LANE, map_cmd):
+        """
+        Assigns T(n) command map_cmd to CUR_LANE, lane that currently has map_cmd is given CUR_LANE's previous command
+
+        :param CUR_LANE: Lane object to assign map_cmd to
+        :param map_cmd: T(n) command to assign to lane
+        """
+        lane = CUR_LANE.name
+        lane_switch=self.AFC.tool_cmds[map_cmd]
+        self.logger.debug("lane to switch is " + lane_switch)
         self.AFC.tool_cmds[map_cmd]=lane
         map_switch=CUR_LANE.map
         CUR_LANE.map=map_cmd
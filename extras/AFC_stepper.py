@@ -5,15 +5,18 @@
 # This file may be distributed under the terms of the GNU GPLv3 license.
 
 import math
+import random
+from bisect import bisect_left
 import chelper
-from contextlib import contextmanager
+import importlib.util
+from functools import partial
 from kinematics import extruder
 from . import AFC_assist
 from configfile import error
-try:
-    from extras.AFC_utils import add_filament_switch
-except:
+# Only report missing AFC_utils as an install problem, errors raised while importing it should surface as is
+if importlib.util.find_spec("extras.AFC_utils") is None:
     raise error("Error trying to import AFC_utils, please rerun install-afc.sh script in your AFC-Klipper-Add-On directory then restart klipper")
+from extras.AFC_utils import add_filament_switch
 
 
 #LED
@@ -21,6 +24,16 @@ BACKGROUND_PRIORITY_CLOCK = 0x7fffffff00000000
 BIT_MAX_TIME=.000004
 RESET_MIN_TIME=.000050
 MAX_MCU_SIZE = 500  # Sanity check on LED chain length
+
+#respooler
+ASSIST_PWM_STEPS = 255          # Assist values within the same 1/255 step result in the same PWM output
+SIXTY_OVER_PI = 60.0 / math.pi  # Converts feed rate over spool diameter to RPM
+REWIND_POLL_TIME = 0.1          # Time between wheel RPM samples during tension rewind
+POLL_JITTER = 0.01              # Random +/- offset added to polling timers so lanes do not all wake in the same reactor pass
+
+#prep
+SAVE_DELAY = 0.5    # Time to wait after a prep sensor change before saving vars, changes in between share one write
+
 def calc_move_time(dist, speed, accel):
     """
     Calculate the movement time and parameters for a given distance, speed, and acceleration.
@@ -51,7 +64,169 @@ def calc_move_time(dist, speed, accel):
     cruise_t = (dist - accel_decel_d) / speed
     return axis_r, accel_t, cruise_t, speed
 
+def make_move_time(speed, accel):
+    """
+    Returns a function equivalent to calc_move_time that is specialized for a fixed speed and acceleration, values that
+    only depend on speed and acceleration are computed once here so the returned function only does distance math.
+    Parameters:
+    speed (float): The speed of the movement.
+    accel (float): The acceleration of the movement.
+    Returns:
+    function: Function taking distance and returning the same tuple as calc_move_time.
+    """
+    sqrt = math.sqrt
+    inv_speed = 1. / speed
+    if not accel:
+        def move_time(dist):
+            axis_r = 1.
+            if dist < 0.:
+                axis_r = -1.
+                dist = -dist
+            return axis_r, 0., dist * inv_speed, speed
+        return move_time
+
+    inv_accel = 1. / accel
+    full_accel_t = speed * inv_accel
+    # Distance needed to accelerate to and decelerate from cruise speed, shorter moves never reach cruise speed
+    crossover_dist = speed * speed * inv_accel
+    def move_time(dist):
+        axis_r = 1.
+        if dist < 0.:
+            axis_r = -1.
+            dist = -dist
+        if not dist:
+            return axis_r, 0., 0., speed
+        if dist < crossover_dist:
+            cruise_v = sqrt(dist * accel)
+            return axis_r, cruise_v * inv_accel, 0., cruise_v
+        return axis_r, full_accel_t, (dist - crossover_dist) * inv_speed, speed
+    return move_time
+
+def calc_move_time_batch(dists, speed, accel, move_time=None, profiles=None):
+    """
+    Calculate movement parameters for a list of distances that share the same speed and acceleration. Distances that
+    repeat (e.g. long moves split into max_move_dis segments) are only calculated once.
+    Parameters:
+    dists (list): Distances to move.
+    speed (float): The speed of the movement.
+    accel (float): The acceleration of the movement.
+    move_time (function): Optional function from make_move_time already specialized for speed and accel.
+    profiles (dict): Optional precalculated calc_move_time tuples for this speed and accel keyed by distance.
+    Returns:
+    list: List containing a calc_move_time tuple for each distance.
+    """
+    if move_time is None:
+        move_time = make_move_time(speed, accel)
+    calculated = {} if profiles is None else profiles.copy()
+    params = []
+    for dist in dists:
+        move_params = calculated.get(dist)
+        if move_params is None:
+            move_params = calculated[dist] = move_time(dist)
+        params.append(move_params)
+    return params
+
+class TensionRewindState:
+    """
+    Holds state for a tension-based rewind while it is being driven by a reactor timer
+    """
+    BASELINE = "baseline"
+    TRACK    = "track"
+
+    def __init__(self, pwm_val, start_time, completion, get_rpm_into, rpm_buf, assist):
+        self.phase          = self.BASELINE
+        # Bound methods resolved once so each timer tick skips the attribute lookups
+        self.get_rpm_into   = get_rpm_into
+        self.rpm_buf        = rpm_buf
+        self.assist         = assist
+        self.pwm_val        = pwm_val
+        self.pwm_start      = pwm_val
+        self.start_time     = start_time
+        self.last_time      = start_time
+        self.completion     = completion
+        # Loop limits, set by rewind_until_tension so ticks only compare against precomputed values
+        self.min_rpm        = 0.0
+        self.baseline_deadline = start_time
+        self.deadline       = start_time
+        self.baseline_rpm   = None
+        self.target_rpm     = None
+        self.cutoff         = None
+        # PI controller gains and integral term, gains are set once baseline RPM is found
+        self.kp             = 0.0
+        self.ki             = 0.0
+        self.integ          = 0.0
+        self.integ_min      = 0.0
+        self.wheel_rpm      = 0.0
+        self.motor_rpm      = 0.0
+
+class AssistMoveContext:
+    """
+    Context manager returned by AFCExtruderStepper.assist_move, starts assist when entered and stops it when exited.
+    Written as a class instead of a generator based contextmanager since it is used for every assisted lane move.
+    """
+    __slots__ = ('lane', 'speed', 'rewind', 'assist_active', 'tension_rewind')
+
+    def __init__(self, lane, speed, rewind, assist_active):
+        self.lane           = lane
+        self.speed          = speed
+        self.rewind         = rewind
+        self.assist_active  = assist_active
+        self.tension_rewind = bool(rewind and lane.wheel_sensor)
+
+    def __enter__(self):
+        if self.assist_active:
+            lane = self.lane
+            lane._wheel_follow_paused = True
+            if self.tension_rewind:
+                # Perform tension-based rewind, assist is already stopped once this returns
+                lane.rewind_until_tension(self.speed)
+            elif self.rewind:
+                lane.assist(lane.calculate_pwm_value(self.speed, True) * -1)
+            else:
+                lane.assist(lane.calculate_pwm_value(self.speed))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        lane = self.lane
+        if self.assist_active:
+            # Only stop motor here if we didn't do a tension-based rewind when entering
+            if not self.tension_rewind:
+                lane.assist(0)
+            # Motor is off either way, clear wheel follow state so the next rpm report can turn it back on. A wheel
+            #  stop reported while paused is dropped, without this wheel follow would think assist is still on
+            lane.assist_activate = False
+        lane._wheel_follow_paused = False
+        return False
+
 class AFCExtruderStepper:
+    # Fixed attribute layout, every attribute set on a lane (including ones set from other AFC modules) needs to be
+    #  listed here
+    __slots__ = (
+        'printer', 'AFC', 'gcode', 'reactor', 'extruder_stepper', 'logger', 'unit_obj', 'hub_obj', 'buffer_obj',
+        'extruder_obj', 'fullname', 'name', 'tool_loaded', 'loaded_to_hub', 'spool_id', 'material', 'color',
+        'weight', 'extruder_temp', 'runout_lane', 'status', 'multi_hubs_found', 'hub', 'buffer_name', 'unit',
+        'index', 'extruder_name', 'map', 'led_index', 'led_name', 'led_fault', 'led_ready', 'led_not_ready',
+        'led_loading', 'led_prep_loaded', 'led_unloading', 'led_tool_loaded', 'long_moves_speed', 'long_moves_accel',
+        'short_moves_speed', 'short_moves_accel', 'short_move_dis', 'max_move_dis', 'n20_break_delay_time',
+        'dist_hub', 'park_dist', 'load_to_hub', 'enable_sensors_in_gui', 'sensor_to_show', 'assisted_unload',
+        'config_dist_hub', 'motion_queue', 'next_cmd_time', 'trapq', 'trapq_append', 'trapq_finalize_moves',
+        'stepper_kinematics', 'assist_activate', '_move_time_funcs', '_move_profiles', 'prep', 'prep_state', 'load',
+        'load_state', 'afc_motor_rwd', 'afc_motor_fwd', 'afc_motor_enb', '_motors', '_motor_scales', '_motor_is_pwm',
+        '_last_assist_q', 'wheel_follow_assist', 'wheel_follow_pwm', 'wheel_follow_min_rpm', '_wheel_follow_paused',
+        'wheel_sensor', 'tension_baseline_min_rpm', 'tension_drop_fraction', 'tension_max_time', '_rewind_state',
+        '_rpm_buf', 'tmc_print_current', 'filament_diameter', 'filament_density', 'inner_diameter', 'outer_diameter',
+        'empty_spool_weight', 'remaining_weight', 'max_motor_rpm', 'rwd_speed_multi', 'fwd_speed_multi',
+        'diameter_range', '_afc_prep_done', 'base_rotation_dist', 'prep_filament_switch_name', 'fila_prep',
+        'load_filament_switch_name', 'fila_load', 'connect_done', 'prep_active', 'last_prep_time',
+        'dist_hub_move_speed', 'dist_hub_move_accel', 'tmc_driver', 'tmc_load_current', '_rpm_weights',
+        '_rpm_per_feed', '_wheel_follow_pwm_clamped', '_get_rpm_into', '_inner_d_sq', '_density_g_mm3',
+        '_filament_area_coeff', '_fwd_pwm_scale', '_rwd_pwm_scale', '_tmc_current_helper', '_save_pending',
+        '_save_timer', '_load_completion', '_status_template', '_filament_status_key', '_filament_status',
+        '_enable_obj', '_diameter_coeff', 'wheel_follow_min_rpm_on', 'wheel_follow_min_rpm_off', '_max_spool_weight',
+        # Set by AFC_error when resetting a lane after a failed load
+        'tool_load',
+    )
+
     def __init__(self, config):
         self.printer            = config.get_printer()
         self.AFC                = self.printer.lookup_object('AFC')
@@ -134,6 +309,8 @@ class AFCExtruderStepper:
         self.stepper_kinematics = ffi_main.gc(
             ffi_lib.cartesian_stepper_alloc(b'x'), ffi_lib.free)
         self.assist_activate=False
+        self._move_time_funcs = {}
+        self._move_profiles = {}
 
         # lane triggers
         buttons = self.printer.load_object(config, "buttons")
@@ -158,6 +335,11 @@ class AFCExtruderStepper:
             self.afc_motor_fwd = AFC_assist.AFCassistMotor(config, 'fwd')
         if self.afc_motor_enb is not None:
             self.afc_motor_enb = AFC_assist.AFCassistMotor(config, 'enb')
+        # Respooler motors indexed by direction (0 = rwd, 1 = fwd) so assist can select motor without branching
+        self._motors        = (self.afc_motor_rwd, self.afc_motor_fwd)
+        self._motor_scales  = tuple(getattr(motor, 'scale', 1.) for motor in self._motors)
+        self._motor_is_pwm  = tuple(getattr(motor, 'is_pwm', False) for motor in self._motors)
+        self._last_assist_q = None                                                                  # Last assist value sent, quantized to PWM resolution
 
         # Optional wheel-follow assist during printing
         self.wheel_follow_assist = config.getboolean(
@@ -165,6 +347,11 @@ class AFCExtruderStepper:
         )
         self.wheel_follow_pwm = config.getfloat("wheel_follow_pwm", 0.3)
         self.wheel_follow_min_rpm = config.getfloat("wheel_follow_min_rpm", 1.0)
+        # Separate on/off thresholds so wheel RPM hovering around wheel_follow_min_rpm does not toggle assist
+        self.wheel_follow_min_rpm_on = config.getfloat("wheel_follow_min_rpm_on", self.wheel_follow_min_rpm)
+        self.wheel_follow_min_rpm_off = config.getfloat("wheel_follow_min_rpm_off", 0.7 * self.wheel_follow_min_rpm_on,
+                                                        maxval=self.wheel_follow_min_rpm_on)
+        self._wheel_follow_pwm_clamped = max(0.0, min(self.wheel_follow_pwm, 1.0))
         self._wheel_follow_paused = False
 
         # ____________Lookup wheel_sensor for tension-based rewind______________________________
@@ -173,19 +360,24 @@ class AFCExtruderStepper:
         if sensor_cfg:
             try:
                 # Expecting a [wheel_sensor <sensor_cfg>] section
-                self.wheel_sensor = self.printer.lookup_object(f"wheel_sensor {sensor_cfg}")
+                self.wheel_sensor = self.printer.lookup_object("wheel_sensor {}".format(sensor_cfg))
             except:
-                self.logger.info(f"{self.name}: No wheel_sensor named '{sensor_cfg}' found; tension detection disabled.")
+                self.logger.info("{}: No wheel_sensor named '{}' found; tension detection disabled.".format(self.name, sensor_cfg))
+        # Bound once so rewind timer does not resolve sensor method every tick
+        self._get_rpm_into = self.wheel_sensor.get_rpm_into if self.wheel_sensor else None
 
         # Tension detection parameters (defaults: 5 RPM baseline, 75% drop, 10s max)
         self.tension_baseline_min_rpm = config.getfloat('tension_baseline_min_rpm', 5.0)
         self.tension_drop_fraction   = config.getfloat('tension_drop_fraction',   0.75)
         self.tension_max_time        = config.getfloat('tension_max_time',        10.0)
+        self._rewind_state           = None
+        self._rpm_buf                = [0.0, 0.0]                                               # Reused (wheel_rpm, motor_rpm) buffer for wheel_sensor reads
 
          # ____________Lookup wheel_sensor for tension-based rewind # Lookup wheel_sensor for tension-based rewind__________________
 
         self.tmc_print_current = config.getfloat("print_current", self.AFC.global_print_current)    # Current to use while printing, set to a lower current to reduce stepper heat when printing. Defaults to global_print_current, if not specified current is not changed.
         self._get_tmc_values( config )
+        self._tmc_current_helper = None                                                             # Looked up on unit connect once TMC objects exist
 
         self.filament_diameter = config.getfloat("filament_diameter", 1.75)                         # Diameter of filament being used
         self.filament_density = config.getfloat("filament_density", 1.24)                           # Density of filament being used
@@ -197,6 +389,17 @@ class AFCExtruderStepper:
         self.rwd_speed_multi = config.getfloat("rwd_speed_multiplier", 0.5)                         # Multiplier to apply to rpm
         self.fwd_speed_multi = config.getfloat("fwd_speed_multiplier", 0.5)                         # Multiplier to apply to rpm
         self.diameter_range = self.outer_diameter - self.inner_diameter  # Range for effective diameter
+        # Constants used by assist RPM/PWM and remaining weight calculations
+        self._inner_d_sq = self.inner_diameter ** 2
+        self._density_g_mm3 = self.filament_density / 1000.0
+        self._filament_area_coeff = math.pi * (self.filament_diameter / 2) ** 2 * self._density_g_mm3      # Grams of filament per mm
+        self._diameter_coeff = 4 / (self._density_g_mm3 * 0.785 * 60 * math.pi)                            # Spool diameter squared per gram of filament on a 60mm wide spool
+        # Weight of a spool wound out to outer_diameter, or starting weight if that is larger. Assisted retracts add
+        #  weight back so remaining weight can end up above the starting weight
+        self._max_spool_weight = max(self.remaining_weight,
+                                     (self.outer_diameter ** 2 - self._inner_d_sq) / self._diameter_coeff)
+        self._update_pwm_constants()
+        self._build_rpm_table()
 
 
         # Defaulting to false so that extruder motors to not move until PREP has been called
@@ -216,6 +419,13 @@ class AFCExtruderStepper:
         self.connect_done = False
         self.prep_active = False
         self.last_prep_time = 0
+        self._save_pending = False
+        self._load_completion = None
+        self._status_template = None
+        self._enable_obj = None
+        self._filament_status_key = None
+        self._filament_status = None
+        self._save_timer = self.reactor.register_timer(self._save_timer_callback)
 
 
 
@@ -225,65 +435,93 @@ class AFCExtruderStepper:
     def rewind_until_tension(self, speed):
         """
         Spin the respooler backward until wheel RPM drops below threshold (baseline * drop_fraction).
+
+        RPM sampling and PWM updates run from a reactor timer so the reactor stays free to service other
+        timers while the rewind is in progress, this function only waits on the timer's completion.
         """
         sensor = self.wheel_sensor
         if sensor is None or self.afc_motor_rwd is None:
-            self.logger.info(f"{self.name}: Cannot perform tension-based rewind (sensor or motor missing).")
+            self.logger.info("{}: Cannot perform tension-based rewind (sensor or motor missing).".format(self.name))
             return
 
         # 1) Compute rewind PWM (negative)
-        pwm_val = self.calculate_pwm_value(speed, rewind=True)
-        if pwm_val > 1.0:
-            pwm_val = 1.0
-        pwm_val = -pwm_val
+        pwm_val = -self.calculate_pwm_value(speed, rewind=True)
 
         # 2) Start the respooler spinning backward
         self.assist(pwm_val)
 
-        # Initialize rpm variables
-        wheel_rpm = 0.0
-        motor_rpm = 0.0
-
-        # 3) Capture baseline RPM (wait for free spin above min RPM)
-        start_time = self.reactor.monotonic()
-        baseline_rpm = None
-        while (self.reactor.monotonic() - start_time) < 2.0:
-            wheel_rpm, motor_rpm = sensor.get_rpm()
-            if wheel_rpm is not None and wheel_rpm > self.tension_baseline_min_rpm:
-                baseline_rpm = wheel_rpm
-                break
-            self.reactor.pause(self.reactor.monotonic() + 0.1)
-
-        if baseline_rpm is None:
+        # 3) Let timer capture baseline RPM and track tension until cutoff or timeout
+        self._rewind_state = state = TensionRewindState(pwm_val, self.reactor.monotonic(), self.reactor.completion(),
+                                                        self._get_rpm_into, self._rpm_buf, self.assist)
+        state.min_rpm = self.tension_baseline_min_rpm
+        state.baseline_deadline = state.start_time + 2.0
+        state.deadline = state.start_time + self.tension_max_time
+        rewind_timer = self.reactor.register_timer(self._rewind_tick, self.reactor.NOW)
+        baseline_found = state.completion.wait()
+        self.reactor.unregister_timer(rewind_timer)
+        self._rewind_state = None
+
+        if not baseline_found:
             self.assist(0)
-            self.logger.info(f"{self.name}: Baseline RPM not found; stopping rewind.")
+            self.logger.info("{}: Baseline RPM not found; stopping rewind.".format(self.name))
             return
 
-        # 4) Continue rewinding until RPM < baseline * drop_fraction
-        cutoff = baseline_rpm * self.tension_drop_fraction
-        target_rpm = baseline_rpm
-        while (self.reactor.monotonic() - start_time) < self.tension_max_time:
-            wheel_rpm, motor_rpm = sensor.get_rpm()
-            if wheel_rpm is not None:
-                # Adjust PWM to keep wheel RPM near the target
-                if wheel_rpm < target_rpm * 0.9:
-                    pwm_val = max(pwm_val - 0.05, -1.0)
-                    self.assist(pwm_val)
-                elif wheel_rpm > target_rpm * 1.1:
-                    pwm_val = min(pwm_val + 0.05, 0.0)
-                    self.assist(pwm_val)
-                if wheel_rpm < cutoff:
-                    break
-            self.reactor.pause(self.reactor.monotonic() + 0.1)
-
-        # 5) Stop the respooler
-        # Report actual wheel and motor RPM at tension detection
-        self.gcode.respond_info(f"Wheel RPM: {wheel_rpm:.1f}  |  Motor RPM: {motor_rpm:.1f}")
+        # 4) Stop the respooler
         self.assist(0)
-        self.gcode.respond_info(f"{self.name}: Tension detected (RPM < {cutoff:.1f}); rewind stopped.")
-
-
+        # Report actual wheel and motor RPM at tension detection, formatted once rewind is done
+        self.gcode.respond_info("Wheel RPM: {:.1f}  |  Motor RPM: {:.1f}\n{}: Tension detected (RPM < {:.1f}); rewind stopped.".format(
+                                state.wheel_rpm, state.motor_rpm, self.name, state.cutoff))
 
+    def _rewind_tick(self, eventtime):
+        """
+        Reactor timer callback for rewind_until_tension, samples wheel RPM every 100ms. Waits up to 2 seconds for
+        the wheel to free spin above tension_baseline_min_rpm, then uses a PI controller to keep wheel RPM near
+        baseline until RPM drops below baseline * drop_fraction or tension_max_time is reached.
+        """
+        state = self._rewind_state
+        rpm_buf = state.rpm_buf
+        if state.get_rpm_into(rpm_buf):
+            wheel_rpm = rpm_buf[0]
+            motor_rpm = rpm_buf[1]
+        else:
+            wheel_rpm = motor_rpm = None
+
+        if state.phase == TensionRewindState.BASELINE:
+            if wheel_rpm is None or wheel_rpm <= state.min_rpm:
+                if eventtime >= state.baseline_deadline:
+                    state.completion.complete(False)
+                    return self.reactor.NEVER
+                return eventtime + REWIND_POLL_TIME + random.uniform(-POLL_JITTER, POLL_JITTER)
+            # First sample above min RPM becomes baseline and target, same sample then continues into tracking
+            state.baseline_rpm = state.target_rpm = wheel_rpm
+            state.cutoff = state.baseline_rpm * self.tension_drop_fraction
+            state.kp = 1.0 / state.baseline_rpm
+            state.ki = state.kp / 0.5
+            state.integ_min = -1.0 / state.ki
+            state.last_time = eventtime
+            state.phase = TensionRewindState.TRACK
+
+        if wheel_rpm is not None:
+            state.wheel_rpm, state.motor_rpm = wheel_rpm, motor_rpm
+            # PI controller to keep wheel RPM near the target, error is negative when wheel is slower than target
+            #  so PWM is pushed further negative (faster rewind). Integral only accumulates speed deficit and is
+            #  clamped so it can add at most full rewind PWM on top of the starting PWM.
+            dt = eventtime - state.last_time
+            state.last_time = eventtime
+            err = wheel_rpm - state.target_rpm
+            state.integ = min(max(state.integ + err * dt, state.integ_min), 0.0)
+            pwm_val = min(max(state.pwm_start + state.kp * err + state.ki * state.integ, -1.0), 0.0)
+            if pwm_val != state.pwm_val:
+                state.pwm_val = pwm_val
+                state.assist(pwm_val)
+            if wheel_rpm < state.cutoff:
+                state.completion.complete(True)
+                return self.reactor.NEVER
+
+        if eventtime >= state.deadline:
+            state.completion.complete(True)
+            return self.reactor.NEVER
+        return eventtime + REWIND_POLL_TIME + random.uniform(-POLL_JITTER, POLL_JITTER)
 
     def __str__(self):
         return self.name
@@ -302,7 +540,7 @@ class AFCExtruderStepper:
                 raise error(error_string)
 
         if self.wheel_follow_assist and self.wheel_sensor:
-            self.reactor.register_timer(self._wheel_follow_handler, self.reactor.NOW)
+            self.wheel_sensor.register_listener(self._on_rpm_update)
 
     def handle_unit_connect(self, unit_obj):
         """
@@ -310,6 +548,7 @@ class AFCExtruderStepper:
         """
         # Saving reference to unit
         self.unit_obj = unit_obj
+        self._tmc_current_helper = self._lookup_tmc_current_helper()
         self.buffer_obj = self.unit_obj.buffer_obj
 
         # Registering lane name in unit
@@ -411,6 +650,27 @@ class AFCExtruderStepper:
         self.dist_hub_move_speed = self.long_moves_speed if self.dist_hub >= 200 else self.short_moves_speed
         self.dist_hub_move_accel = self.long_moves_accel if self.dist_hub >= 200 else self.short_moves_accel
 
+        # Build move time functions for speed/accel pairs this lane uses for its filament moves
+        for speed, accel in ((self.long_moves_speed, self.long_moves_accel),
+                             (self.short_moves_speed, self.short_moves_accel)):
+            if speed and (speed, accel) not in self._move_time_funcs:
+                self._move_time_funcs[(speed, accel)] = make_move_time(speed, accel)
+
+        # Precalculate profiles for move distances this lane uses over and over, split long moves included
+        hub_move_dis = getattr(self.hub_obj, 'move_dis', None)
+        canonical_moves = ((self.short_move_dis, self.short_moves_speed, self.short_moves_accel),
+                           (hub_move_dis,        self.short_moves_speed, self.short_moves_accel),
+                           (self.dist_hub,       self.dist_hub_move_speed, self.dist_hub_move_accel),
+                           (self.max_move_dis,   self.long_moves_speed,  self.long_moves_accel),
+                           (self.max_move_dis,   self.short_moves_speed, self.short_moves_accel))
+        for dist, speed, accel in canonical_moves:
+            if not dist or not speed:
+                continue
+            move_time = self._move_time_funcs[(speed, accel)]
+            profiles = self._move_profiles.setdefault((speed, accel), {})
+            for move_dist in (dist, -dist):
+                profiles[move_dist] = move_time(move_dist)
+
         # Register macros
         self.gcode.register_mux_command('SET_LANE_LOADED',    "LANE", self.name, self.cmd_SET_LANE_LOADED, desc=self.cmd_SET_LANE_LOADED_help)
 
@@ -424,150 +684,157 @@ class AFCExtruderStepper:
         # Send out event so that macros and be registered properly with valid lane names
         self.printer.send_event("afc_stepper:register_macros", self)
 
+        self._build_status_template()
         self.connect_done = True
 
     def _get_tmc_values(self, config):
         """
         Searches for TMC driver that corresponds to stepper to get run current that is specified in config
         """
+        # Map of stepper section names to TMC section names is built once and shared with all lanes
+        tmc_sections = self.AFC.tmc_sections
+        if tmc_sections is None:
+            tmc_sections = self.AFC.tmc_sections = {s.split(None, 1)[1]: s for s in config.fileconfig.sections()
+                                                    if s.startswith('tmc') and ' ' in s}
         try:
-            self.tmc_driver = next(config.getsection(s) for s in config.fileconfig.sections() if 'tmc' in s and config.get_name() in s)
-        except:
+            self.tmc_driver = config.getsection(tmc_sections[config.get_name()])
+        except KeyError:
             raise self.gcode.error("Count not find TMC for stepper {}".format(self.name))
 
         self.tmc_load_current = self.tmc_driver.getfloat('run_current')
 
-    def brake_n20(self):
+    def _set_brake_pins(self, print_time, value):
         '''
-        Helper function to "brake" n20 motors to hopefully help with keeping down backfeeding into MCU board
+        Helper function to set rwd, enb and fwd(if defined) n20 motor pins to the same value at print_time
         '''
-        self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_rwd._set_pin(print_time, 1))
-        self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_enb._set_pin(print_time, 1))
+        self.afc_motor_rwd._set_pin(print_time, value)
+        self.afc_motor_enb._set_pin(print_time, value)
         if self.afc_motor_fwd is not None:
-            self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_fwd._set_pin(print_time, 1))
+            self.afc_motor_fwd._set_pin(print_time, value)
 
-        self.AFC.reactor.pause(self.AFC.reactor.monotonic() + self.n20_break_delay_time)
+    def _schedule_brake(self, print_time):
+        '''
+        Lookahead callback that schedules brake on at print_time and brake release n20_break_delay_time later, MCU
+        buffers both pin updates so nothing needs to wait on the host side
+        '''
+        self._set_brake_pins(print_time, 1)
+        self._set_brake_pins(print_time + self.n20_break_delay_time, 0)
 
-        self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_rwd._set_pin(print_time, 0))
-        self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_enb._set_pin(print_time, 0))
-        if self.afc_motor_fwd is not None:
-            self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_fwd._set_pin(print_time, 0))
+    def brake_n20(self):
+        '''
+        Helper function to "brake" n20 motors to hopefully help with keeping down backfeeding into MCU board
+        '''
+        self.AFC.toolhead.register_lookahead_callback(self._schedule_brake)
+
+    def _queue_pin(self, motor, value):
+        '''
+        Helper function to set assist motor pin to value at the next lookahead print time
+        '''
+        self.AFC.toolhead.register_lookahead_callback(partial(motor._set_pin, value=value))
 
     def assist(self, value, is_resend=False):
         if self.afc_motor_rwd is None:
             return
-        if value < 0:
-            value *= -1
-            assit_motor=self.afc_motor_rwd
-        elif value > 0:
-            if self.afc_motor_fwd is None:
-                return
-            else:
-                assit_motor=self.afc_motor_fwd
-        elif value == 0:
+        # Skip requests that would resolve to the same PWM output that was last sent
+        quantized = round(value * ASSIST_PWM_STEPS) / ASSIST_PWM_STEPS
+        if quantized == self._last_assist_q and not is_resend:
+            return
+        self._last_assist_q = quantized
+        if value == 0:
             if self.afc_motor_enb is not None:
                 self.brake_n20()
             else:
-                self.AFC.toolhead.register_lookahead_callback(lambda print_time: self.afc_motor_rwd._set_pin(print_time, value))
+                self._queue_pin(self.afc_motor_rwd, value)
+            return
 
+        # Index 0 is rwd motor for negative values, index 1 is fwd motor for positive values
+        idx = int(value > 0)
+        assit_motor = self._motors[idx]
+        if assit_motor is None:
             return
-        value /= assit_motor.scale
-        if not assit_motor.is_pwm and value not in [0., 1.]:
-            if value > 0:
-                value = 1
+        # Digital motors can only be fully on
+        value = abs(value) / self._motor_scales[idx] if self._motor_is_pwm[idx] else 1
         if self.afc_motor_enb is not None:
-            if value != 0:
-                enable = 1
-            else:
-                enable = 0
-            self.AFC.toolhead.register_lookahead_callback(
-            lambda print_time: self.afc_motor_enb._set_pin(print_time, enable))
+            self._queue_pin(self.afc_motor_enb, 1)
 
-        self.AFC.toolhead.register_lookahead_callback(
-            lambda print_time: assit_motor._set_pin(print_time, value))
+        self._queue_pin(assit_motor, value)
 
-    @contextmanager
     def assist_move(self, speed, rewind, assist_active=True):
         """
         Starts an assist move and returns a context manager that turns off the assist move when it exits.
          - For forward assist (rewind=False), uses the existing PWM-based assist logic.
          - For rewind (rewind=True) and a wheel_sensor configured, performs tension-based rewind.
         """
-        if assist_active:
-            self._wheel_follow_paused = True
-            if rewind and self.wheel_sensor:
-                # Perform tension-based rewind, then exit immediately
-                self.rewind_until_tension(speed)
-                yield
-                self._wheel_follow_paused = False
-                return
-            else:
-                if rewind:
-                    value = self.calculate_pwm_value(speed, True) * -1
-                else:
-                    value = self.calculate_pwm_value(speed)
-                if value > 1.0:
-                    value = 1.0
-                self.assist(value)
-        try:
-            yield
-        finally:
-            # Only stop motor here if we didn't do a tension-based rewind above
-            if assist_active and not (rewind and self.wheel_sensor):
-                self.assist(0)
-            self._wheel_follow_paused = False
+        return AssistMoveContext(self, speed, rewind, assist_active)
 
-    def _wheel_follow_handler(self, eventtime):
+    def _on_rpm_update(self, rpm):
+        """
+        Wheel sensor listener for wheel follow assist, called on every sensor report while the wheel turns and once
+        when wheel stops. Turns assist on when wheel RPM reaches wheel_follow_min_rpm_on and only turns it back off
+        once RPM falls below wheel_follow_min_rpm_off.
+        """
         if self._wheel_follow_paused:
-            return eventtime + 0.1
-
-        rpm, _ = (self.wheel_sensor.get_rpm() if self.wheel_sensor else (None, None))
-        if rpm is not None and rpm >= self.wheel_follow_min_rpm:
-            if not self.assist_activate:
-                pwm = max(0.0, min(self.wheel_follow_pwm, 1.0))
-                self.assist(pwm)
-                self.assist_activate = True
-        else:
-            if self.assist_activate:
+            return
+
+        if self.assist_activate:
+            if rpm < self.wheel_follow_min_rpm_off:
                 self.assist(0)
                 self.assist_activate = False
-        return eventtime + 0.1
+        elif rpm >= self.wheel_follow_min_rpm_on:
+            self.assist(self._wheel_follow_pwm_clamped)
+            self.assist_activate = True
 
-    def _move(self, distance, speed, accel, assist_active=False):
+    def _move_chunks(self, chunks, speed, accel, chunk_params=None):
         """
-        Helper function to move the specified lane a given distance with specified speed and acceleration.
-        This function calculates the movement parameters and commands the stepper motor
-        to move the lane accordingly.
+        Helper function to move the specified lane through each chunk of a move with specified speed and acceleration.
+        Each chunk is queued as its own move and its steps are generated, flushed and waited on before the next chunk
+        is queued so that no more than max_move_dis worth of steps are queued at once.
         Parameters:
-        distance (float): The distance to move.
+        chunks (list): Distances to move, all in the same direction.
         speed (float): The speed of the movement.
         accel (float): The acceleration of the movement.
+        chunk_params (list): Optional calc_move_time tuples already calculated for each chunk.
         """
-
-        if assist_active:
-            self.update_remaining_weight(distance)
-
-        with self.assist_move(speed, distance < 0, assist_active):
-            toolhead = self.printer.lookup_object('toolhead')
-            toolhead.flush_step_generation()
-            prev_sk = self.extruder_stepper.stepper.set_stepper_kinematics(self.stepper_kinematics)
-            prev_trapq = self.extruder_stepper.stepper.set_trapq(self.trapq)
-            self.extruder_stepper.stepper.set_position((0., 0., 0.))
-            axis_r, accel_t, cruise_t, cruise_v = calc_move_time(distance, speed, accel)
+        toolhead = self.printer.lookup_object('toolhead')
+        stepper = self.extruder_stepper.stepper
+        if chunk_params is None:
+            chunk_params = [calc_move_time(dist, speed, accel) for dist in chunks]
+        # trapq and its cffi functions are bound once for all chunks
+        trapq = self.trapq
+        trapq_append = self.trapq_append
+        trapq_finalize_moves = self.trapq_finalize_moves
+        stepper_kinematics = self.stepper_kinematics
+        toolhead.flush_step_generation()
+        for axis_r, accel_t, cruise_t, cruise_v in chunk_params:
+            prev_sk = stepper.set_stepper_kinematics(stepper_kinematics)
+            prev_trapq = stepper.set_trapq(trapq)
+            stepper.set_position((0., 0., 0.))
             print_time = toolhead.get_last_move_time()
-            self.trapq_append(self.trapq, print_time, accel_t, cruise_t, accel_t,
-                              0., 0., 0., axis_r, 0., 0., 0., cruise_v, accel)
-            print_time = print_time + accel_t + cruise_t + accel_t
-            self.extruder_stepper.stepper.generate_steps(print_time)
-            self.trapq_finalize_moves(self.trapq, print_time + 99999.9,
-                                      print_time + 99999.9)
-            self.extruder_stepper.stepper.set_trapq(prev_trapq)
-            self.extruder_stepper.stepper.set_stepper_kinematics(prev_sk)
+            trapq_append(trapq, print_time, accel_t, cruise_t, accel_t,
+                         0., 0., 0., axis_r, 0., 0., 0., cruise_v, accel)
+            move_time = accel_t + cruise_t + accel_t
+            print_time = print_time + move_time
+            stepper.generate_steps(print_time)
+            trapq_finalize_moves(trapq, print_time + 99999.9,
+                                 print_time + 99999.9)
+            stepper.set_trapq(prev_trapq)
+            stepper.set_stepper_kinematics(prev_sk)
             toolhead.note_mcu_movequeue_activity(print_time)
-            toolhead.dwell(accel_t + cruise_t + accel_t)
+            toolhead.dwell(move_time)
+            # Also serves as the flush before swapping kinematics for the next chunk
             toolhead.flush_step_generation()
             toolhead.wait_moves()
 
+    def _assisted_move_chunks(self, chunks, speed, accel, chunk_params=None):
+        """
+        Same as _move_chunks but runs the respooler assist for the duration of the moves and updates remaining spool
+        weight. Parameters are the same as _move_chunks.
+        """
+        distance = sum(chunks)
+        self.update_remaining_weight(distance)
+        with self.assist_move(speed, distance < 0):
+            self._move_chunks(chunks, speed, accel, chunk_params)
+
     def move(self, distance, speed, accel, assist_active=False):
         """
         Move the specified lane a given distance with specified speed and acceleration.
@@ -580,15 +847,23 @@ class AFCExtruderStepper:
         """
         direction = 1 if distance > 0 else -1
         move_total = abs(distance)
+        if not move_total:
+            return
 
         # Breaks up move length to help with TTC errors
-        while move_total > 0:
-            move_value = self.max_move_dis if move_total > self.max_move_dis else move_total
-            move_total -= move_value
+        max_move_dis = self.max_move_dis
+        full_chunks = int(move_total // max_move_dis)
+        chunks = [max_move_dis * direction] * full_chunks
+        remainder = move_total - full_chunks * max_move_dis
+        if remainder > 0:
             # Adding back direction
-            move_value = move_value * direction
+            chunks.append(remainder * direction)
 
-            self._move(move_value, speed, accel, assist_active)
+        # Calculate movement parameters for all chunks up front, repeated chunk lengths are only calculated once
+        chunk_params = calc_move_time_batch(chunks, speed, accel, self._move_time_funcs.get((speed, accel)),
+                                            self._move_profiles.get((speed, accel)))
+        mover = self._assisted_move_chunks if assist_active else self._move_chunks
+        mover(chunks, speed, accel, chunk_params)
 
     def set_afc_prep_done(self):
         """
@@ -600,6 +875,8 @@ class AFCExtruderStepper:
 
     def load_callback(self, eventtime, state):
         self.load_state = state
+        if state and self._load_completion is not None:
+            self._load_completion.complete(True)
 
     def prep_callback(self, eventtime, state):
         self.prep_state = state
@@ -617,121 +894,153 @@ class AFCExtruderStepper:
         self.prep_active = True
 
         # Checking to make sure printer is ready and making sure PREP has been called before trying to load anything
-        for i in range(1):
-        # Hacky way for do{}while(0) loop, DO NOT return from this for loop, use break instead so that self.prep_state variable gets sets correctly
-        #  before exiting function
-            if self.printer.state_message == 'Printer is ready' and True == self._afc_prep_done and self.status != 'Tool Unloading':
-                # Only try to load when load state trigger is false
-                if self.prep_state == True and self.load_state == False:
-                    x = 0
-                    # Checking to make sure last time prep switch was activated was less than 1 second, returning to keep is printing message from spamming
-                    # the console since it takes klipper some time to transition to idle when idle_resume=printing
-                    if delta_time < 1.0:
-                        break
-
-                    # Check to see if the printer is printing or moving, as trying to load while printer is doing something will crash klipper
-                    if self.AFC.FUNCTION.is_printing(check_movement=True):
-                        self.AFC.ERROR.AFC_error("Cannot load spools while printer is actively moving or homing", False)
-                        break
+        try:
+            self._handle_prep_edge(delta_time)
+        finally:
+            self.prep_active = False
+            self._schedule_save()
+
+    def _schedule_save(self):
+        """
+        Saves vars SAVE_DELAY seconds from now, calls made before the save happens are coalesced into the same write
+        """
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self.reactor.update_timer(self._save_timer, self.reactor.monotonic() + SAVE_DELAY)
+
+    def _save_timer_callback(self, eventtime):
+        self._save_pending = False
+        self.AFC.save_vars()
+        return self.reactor.NEVER
 
+    def _handle_prep_edge(self, delta_time):
+        """
+        Handles prep sensor state change, loads newly inserted filament to hub or triggers infinite spool/runout logic
+        when filament runs out. prep_callback resets prep_active and saves vars once this returns.
+
+        :param delta_time: Time since last prep sensor change
+        """
+        FUNCTION = self.AFC.FUNCTION
+        ERROR = self.AFC.ERROR
+        if self.printer.state_message == 'Printer is ready' and True == self._afc_prep_done and self.status != 'Tool Unloading':
+            # Only try to load when load state trigger is false
+            if self.prep_state == True and self.load_state == False:
+                x = 0
+                # Checking to make sure last time prep switch was activated was less than 1 second, returning to keep is printing message from spamming
+                # the console since it takes klipper some time to transition to idle when idle_resume=printing
+                if delta_time < 1.0:
+                    return
+
+                # Check to see if the printer is printing or moving, as trying to load while printer is doing something will crash klipper
+                if FUNCTION.is_printing(check_movement=True):
+                    ERROR.AFC_error("Cannot load spools while printer is actively moving or homing", False)
+                    return
+
+                try:
                     while self.load_state == False and self.prep_state == True and self.load != None:
+                        if not x:
+                            self.do_enable(True)
                         x += 1
-                        self.do_enable(True)
+                        # load_callback completes this as soon as load sensor triggers so waiting after the move ends
+                        #  early, new one each pass so a sensor that bounces back off still waits on later passes
+                        load_completion = self._load_completion = self.reactor.completion()
                         self.move(10,500,400)
-                        self.reactor.pause(self.reactor.monotonic() + 0.1)
+                        load_completion.wait(self.reactor.monotonic() + 0.1)
                         if x> 40:
                             msg = (' FAILED TO LOAD, CHECK FILAMENT AT TRIGGER\n||==>--||----||------||\nTRG   LOAD   HUB    TOOL')
-                            self.AFC.ERROR.AFC_error(msg, False)
-                            self.AFC.FUNCTION.afc_led(self.AFC.led_fault, self.led_index)
+                            ERROR.AFC_error(msg, False)
+                            FUNCTION.afc_led(self.AFC.led_fault, self.led_index)
                             self.status=''
                             break
-                    self.status=''
-
-                    # Verify that load state is still true as this would still trigger if prep sensor was triggered and then filament was removed
-                    #   This is only really a issue when using direct and still using load sensor
-                    if self.hub == 'direct' and self.prep_state:
-                        self.AFC.afcDeltaTime.set_start_time()
-                        self.AFC.TOOL_LOAD(self)
-                        self.material = self.AFC.default_material_type
-                        break
-
-                    # Checking if loaded to hub(it should not be since filament was just inserted), if false load to hub. Does a fast load if hub distance is over 200mm
-                    if self.load_to_hub and not self.loaded_to_hub and self.load_state and self.prep_state:
-                        self.move(self.dist_hub, self.dist_hub_move_speed, self.dist_hub_move_accel, self.dist_hub > 200)
-                        self.loaded_to_hub = True
-
-                    self.do_enable(False)
-                    if self.load_state == True and self.prep_state == True:
-                        self.status = 'Loaded'
-                        self.AFC.FUNCTION.afc_led(self.AFC.led_ready, self.led_index)
-                        self.material = self.AFC.default_material_type
-
-                elif self.prep_state == False and self.name == self.AFC.current and self.AFC.FUNCTION.is_printing() and self.load_state and self.status != 'ejecting':
-                    # Checking to make sure runout_lane is set and does not equal 'NONE'
-                    if  self.runout_lane != 'NONE':
-                        self.status = None
-                        self.AFC.FUNCTION.afc_led(self.AFC.led_not_ready, self.led_index)
-                        self.logger.info("Infinite Spool triggered for {}".format(self.name))
-                        empty_LANE = self.AFC.lanes[self.AFC.current]
-                        change_LANE = self.AFC.lanes[self.runout_lane]
-                        # Pause printer with manual command
-                        self.AFC.ERROR.pause_resume.send_pause_command()
-                        # Saving position after printer is paused
+                finally:
+                    self._load_completion = None
+                self.status=''
+
+                # Verify that load state is still true as this would still trigger if prep sensor was triggered and then filament was removed
+                #   This is only really a issue when using direct and still using load sensor
+                if self.hub == 'direct' and self.prep_state:
+                    self.AFC.afcDeltaTime.set_start_time()
+                    self.AFC.TOOL_LOAD(self)
+                    self.material = self.AFC.default_material_type
+                    return
+
+                # Checking if loaded to hub(it should not be since filament was just inserted), if false load to hub. Does a fast load if hub distance is over 200mm
+                if self.load_to_hub and not self.loaded_to_hub and self.load_state and self.prep_state:
+                    self.move(self.dist_hub, self.dist_hub_move_speed, self.dist_hub_move_accel, self.dist_hub > 200)
+                    self.loaded_to_hub = True
+
+                self.do_enable(False)
+                if self.load_state == True and self.prep_state == True:
+                    self.status = 'Loaded'
+                    FUNCTION.afc_led(self.AFC.led_ready, self.led_index)
+                    self.material = self.AFC.default_material_type
+
+            elif self.prep_state == False and self.name == self.AFC.current and FUNCTION.is_printing() and self.load_state and self.status != 'ejecting':
+                # Checking to make sure runout_lane is set and does not equal 'NONE'
+                if  self.runout_lane != 'NONE':
+                    self.status = None
+                    FUNCTION.afc_led(self.AFC.led_not_ready, self.led_index)
+                    self.logger.info("Infinite Spool triggered for {}".format(self.name))
+                    empty_LANE = self.AFC.lanes[self.AFC.current]
+                    change_LANE = self.AFC.lanes[self.runout_lane]
+                    # Pause printer with manual command
+                    ERROR.pause_resume.send_pause_command()
+                    # Saving position after printer is paused
+                    self.AFC.save_pos()
+                    # Change Tool and don't restore position. Position will be restored after lane is unloaded
+                    #  so that nozzle does not sit on print while lane is unloading
+                    self.AFC.CHANGE_TOOL(change_LANE, restore_pos=False)
+                    # Change Mapping
+                    self.AFC.SPOOL.set_map(change_LANE, empty_LANE.map)
+                    # Only continue if a error did not happen
+                    if not self.AFC.error_state:
+                        # Eject lane from BT
+                        self.AFC.LANE_UNLOAD(empty_LANE)
+                        # Resume pos
+                        self.AFC.restore_pos()
+                        # Resume with manual issued command
+                        ERROR.pause_resume.send_resume_command()
+                        # Set LED to not ready
+                        FUNCTION.afc_led(self.led_not_ready, self.led_index)
+                else:
+                    # Unload if user has set AFC to unload on runout
+                    if self.unit_obj.unload_on_runout:
+                        # Pause printer
+                        ERROR.pause_resume.send_pause_command()
                         self.AFC.save_pos()
-                        # Change Tool and don't restore position. Position will be restored after lane is unloaded
-                        #  so that nozzle does not sit on print while lane is unloading
-                        self.AFC.CHANGE_TOOL(change_LANE, restore_pos=False)
-                        # Change Mapping
-                        self.gcode.run_script_from_command('SET_MAP LANE={} MAP={}'.format(change_LANE.name, empty_LANE.map))
-                        # Only continue if a error did not happen
+                        # self.gcode.run_script_from_command('PAUSE')
+                        self.AFC.TOOL_UNLOAD(self)
                         if not self.AFC.error_state:
-                            # Eject lane from BT
-                            self.gcode.run_script_from_command('LANE_UNLOAD LANE={}'.format(empty_LANE.name))
-                            # Resume pos
-                            self.AFC.restore_pos()
-                            # Resume with manual issued command
-                            self.AFC.ERROR.pause_resume.send_resume_command()
-                            # Set LED to not ready
-                            self.AFC.FUNCTION.afc_led(self.led_not_ready, self.led_index)
-                    else:
-                        # Unload if user has set AFC to unload on runout
-                        if self.unit_obj.unload_on_runout:
-                            # Pause printer
-                            self.AFC.ERROR.pause_resume.send_pause_command()
-                            self.AFC.save_pos()
-                            # self.gcode.run_script_from_command('PAUSE')
-                            self.AFC.TOOL_UNLOAD(self)
-                            if not self.AFC.error_state:
-                                self.AFC.LANE_UNLOAD(self)
-                        # Pause print
-                        self.status = None
-                        msg = "Runout triggered for lane {} and runout lane is not setup to switch to another lane".format(self.name)
-                        msg += "\nPlease manually load next spool into toolhead and then hit resume to continue"
-                        self.AFC.FUNCTION.afc_led(self.AFC.led_not_ready, self.led_index)
-                        self.AFC.ERROR.AFC_error(msg)
-
-                elif self.prep_state == True and self.load_state == True and not self.AFC.FUNCTION.is_printing():
-                    message = 'Cannot load {} load sensor is triggered.'.format(self.name)
-                    message += '\n    Make sure filament is not stuck in load sensor or check to make sure load sensor is not stuck triggered.'
-                    message += '\n    Once cleared try loading again'
-                    self.AFC.ERROR.AFC_error(message, pause=False)
-                else:
+                            self.AFC.LANE_UNLOAD(self)
+                    # Pause print
                     self.status = None
-                    self.loaded_to_hub = False
-                    self.AFC.SPOOL._clear_values(self)
-                    self.AFC.FUNCTION.afc_led(self.AFC.led_not_ready, self.led_index)
-
-        self.prep_active = False
-        self.AFC.save_vars()
+                    msg = "Runout triggered for lane {} and runout lane is not setup to switch to another lane".format(self.name)
+                    msg += "\nPlease manually load next spool into toolhead and then hit resume to continue"
+                    FUNCTION.afc_led(self.AFC.led_not_ready, self.led_index)
+                    ERROR.AFC_error(msg)
+
+            elif self.prep_state == True and self.load_state == True and not FUNCTION.is_printing():
+                message = 'Cannot load {} load sensor is triggered.'.format(self.name)
+                message += '\n    Make sure filament is not stuck in load sensor or check to make sure load sensor is not stuck triggered.'
+                message += '\n    Once cleared try loading again'
+                ERROR.AFC_error(message, pause=False)
+            else:
+                self.status = None
+                self.loaded_to_hub = False
+                self.AFC.SPOOL._clear_values(self)
+                FUNCTION.afc_led(self.AFC.led_not_ready, self.led_index)
 
     def do_enable(self, enable):
         self.sync_print_time()
-        stepper_enable = self.printer.lookup_object('stepper_enable')
+        se = self._enable_obj
+        if se is None:
+            # Enable tracking object does not change, look it up on first use and reuse it
+            stepper_enable = self.printer.lookup_object('stepper_enable')
+            se = self._enable_obj = stepper_enable.lookup_enable('AFC_stepper ' + self.name)
         if enable:
-            se = stepper_enable.lookup_enable('AFC_stepper ' + self.name)
             se.motor_enable(self.next_cmd_time)
         else:
-            se = stepper_enable.lookup_enable('AFC_stepper ' + self.name)
             se.motor_disable(self.next_cmd_time)
         self.sync_print_time()
 
@@ -767,8 +1076,28 @@ class AFCExtruderStepper:
 
         :param current: Sets TMC current to specified value
         """
-        if self.tmc_print_current is not None:
-            self.gcode.run_script_from_command("SET_TMC_CURRENT STEPPER='{}' CURRENT={}".format(self.name, current))
+        if self.tmc_print_current is None:
+            return
+
+        current_helper = self._tmc_current_helper
+        if current_helper is not None:
+            # Same steps as SET_TMC_CURRENT without going through the gcode parser, currents above driver max still use
+            #  the gcode command so the user gets the normal error
+            prev_cur, prev_hold_cur, req_hold_cur, max_cur = current_helper.get_current()
+            if current <= max_cur:
+                print_time = self.printer.lookup_object('toolhead').get_last_move_time()
+                current_helper.set_current(current, req_hold_cur, print_time)
+                return
+        self.gcode.run_script_from_command("SET_TMC_CURRENT STEPPER='{}' CURRENT={}".format(self.name, current))
+
+    def _lookup_tmc_current_helper(self):
+        """
+        Returns current helper of TMC driver for this stepper so current can be changed directly, returns None if driver
+        object does not expose one and SET_TMC_CURRENT should be used instead
+        """
+        tmc_obj = self.printer.lookup_object(self.tmc_driver.get_name(), None)
+        cmdhelper = getattr(getattr(tmc_obj, 'get_status', None), '__self__', None)
+        return getattr(cmdhelper, 'current_helper', None)
 
     def set_load_current(self):
         """
@@ -787,15 +1116,60 @@ class AFCExtruderStepper:
 
     def calculate_effective_diameter(self, weight_g, spool_width_mm=60):
 
-        # Calculate the cross-sectional area of the filament
-        density_g_mm3 = self.filament_density / 1000.0
-        filament_volume_mm3 = weight_g / density_g_mm3
-        package_corrected_volume_mm3 = filament_volume_mm3 / 0.785
-        filament_area_mm2 = package_corrected_volume_mm3 / spool_width_mm
-        spool_outer_diameter_mm2 = (4 * filament_area_mm2 / 3.14159) + self.inner_diameter ** 2
-        spool_outer_diameter_mm = spool_outer_diameter_mm2 ** 0.5
+        # Weight to filament volume, corrected for packing and spread over the spool width, gives the cross-sectional
+        #  area of the filament wound on the spool. All of the constant factors are folded into _diameter_coeff
+        if spool_width_mm == 60:
+            diameter_coeff = self._diameter_coeff
+        else:
+            diameter_coeff = 4 / (self._density_g_mm3 * 0.785 * spool_width_mm * math.pi)
+        spool_outer_diameter_mm2 = weight_g * diameter_coeff + self._inner_d_sq
+
+        return spool_outer_diameter_mm2 ** 0.5
+
+    def _build_rpm_table(self, points=64):
+        """
+        Builds a lookup table of assist motor RPM per mm/s of filament feed rate for weights between empty spool weight
+        and full spool weight. Remaining weight goes down on assisted loads and back up on assisted retracts, covering
+        the full spool means table only needs to be built once and calculate_rpm can interpolate from it instead of
+        recalculating the effective diameter on every assist move. Weights are spaced closer together towards an empty
+        spool where RPM changes the fastest. Tables are shared between lanes with the same spool geometry so units with
+        many identical lanes only build them once.
+
+        :param points: Number of weights to calculate RPM values for
+        """
+        self._rpm_weights = None
+        low = self.empty_spool_weight
+        high = self._max_spool_weight
+        if high <= low:
+            return
+        key = (low, high, self._density_g_mm3, self._inner_d_sq, points)
+        table = self.AFC.rpm_tables.get(key)
+        if table is None:
+            span = high - low
+            weights = [low + span * (i / (points - 1)) ** 2 for i in range(points)]
+            rpm_per_feed = [SIXTY_OVER_PI / self.calculate_effective_diameter(weight) for weight in weights]
+            table = self.AFC.rpm_tables[key] = (weights, rpm_per_feed)
+        self._rpm_weights, self._rpm_per_feed = table
+
+    def lookup_rpm_per_feed(self, weight_g):
+        """
+        Returns assist motor RPM per mm/s of feed rate for weight by binary searching the RPM table and linearly
+        interpolating between the two closest weights. update_remaining_weight keeps remaining weight inside the table,
+        calculating directly is only a fallback for lanes without a table or weights passed in from elsewhere.
 
-        return spool_outer_diameter_mm
+        :param weight_g: Remaining weight in grams
+        :return: Assist motor RPM for 1 mm/s feed rate
+        """
+        weights = self._rpm_weights
+        if weights is None or not weights[0] <= weight_g <= weights[-1]:
+            return SIXTY_OVER_PI / self.calculate_effective_diameter(weight_g)
+        idx = bisect_left(weights, weight_g)
+        rpm_per_feed = self._rpm_per_feed
+        if idx == 0:
+            return rpm_per_feed[0]
+        low_weight = weights[idx - 1]
+        low_rpm = rpm_per_feed[idx - 1]
+        return low_rpm + (rpm_per_feed[idx] - low_rpm) * (weight_g - low_weight) / (weights[idx] - low_weight)
 
     def calculate_rpm(self, feed_rate):
         """
@@ -804,15 +1178,14 @@ class AFCExtruderStepper:
         :param feed_rate: Filament feed rate in mm/s
         :return: Calculated RPM for the assist motor
         """
-        if self.remaining_weight <= self.empty_spool_weight:
+        remaining_weight = self.remaining_weight
+        if remaining_weight <= self.empty_spool_weight:
             return 0  # No filament left to assist
 
-        # Calculate the effective diameter
-        effective_diameter = self.calculate_effective_diameter(self.remaining_weight)
-
-        # Calculate RPM
-        rpm = (feed_rate * 60) / (math.pi * effective_diameter)
-        return min(rpm, self.max_motor_rpm)  # Clamp to max motor RPM
+        # Calculate RPM from effective diameter of remaining filament
+        rpm = feed_rate * self.lookup_rpm_per_feed(remaining_weight)
+        max_rpm = self.max_motor_rpm
+        return max_rpm if rpm > max_rpm else rpm  # Clamp to max motor RPM
 
     def calculate_pwm_value(self, feed_rate, rewind=False):
         """
@@ -821,12 +1194,17 @@ class AFCExtruderStepper:
         :param feed_rate: Filament feed rate in mm/s
         :return: PWM value between 0 and 1
         """
-        rpm = self.calculate_rpm(feed_rate)
-        if not rewind:
-            pwm_value = rpm / (self.max_motor_rpm / (1 + 9 * self.fwd_speed_multi))
-        else:
-            pwm_value = rpm / (self.max_motor_rpm / (15 + 15 * self.rwd_speed_multi))
-        return max(0.0, min(pwm_value, 1.0))  # Clamp the value between 0 and 1
+        pwm_value = self.calculate_rpm(feed_rate) * (self._rwd_pwm_scale if rewind else self._fwd_pwm_scale)
+        # Clamp the value between 0 and 1, callers rely on this being the only clamp
+        return 1.0 if pwm_value > 1.0 else (0.0 if pwm_value < 0.0 else pwm_value)
+
+    def _update_pwm_constants(self):
+        """
+        Helper function to update RPM to PWM scale for forward and reverse assist, needs to be called whenever
+        max_motor_rpm, fwd_speed_multi or rwd_speed_multi changes
+        """
+        self._fwd_pwm_scale = (1 + 9 * self.fwd_speed_multi) / self.max_motor_rpm
+        self._rwd_pwm_scale = (15 + 15 * self.rwd_speed_multi) / self.max_motor_rpm
 
     def update_remaining_weight(self, distance_moved):
         """
@@ -834,12 +1212,15 @@ class AFCExtruderStepper:
 
         :param distance_moved: Distance of filament moved in mm.
         """
-        filament_volume_mm3 = math.pi * (self.filament_diameter / 2) ** 2 * distance_moved
-        filament_weight_change = filament_volume_mm3 * self.filament_density / 1000  # Convert mm cubed to g
-        self.remaining_weight -= filament_weight_change
-
-        if self.remaining_weight < self.empty_spool_weight:
-            self.remaining_weight = self.empty_spool_weight  # Ensure weight doesn't drop below empty spool weight
+        # Keep weight between empty and full spool weight, this also keeps it inside the RPM table
+        remaining_weight = self.remaining_weight - distance_moved * self._filament_area_coeff
+        empty_weight = self.empty_spool_weight
+        max_weight = self._max_spool_weight
+        if remaining_weight < empty_weight:
+            remaining_weight = empty_weight
+        elif remaining_weight > max_weight:
+            remaining_weight = max_weight
+        self.remaining_weight = remaining_weight
 
     def set_loaded(self):
         """
@@ -977,6 +1358,7 @@ class AFCExtruderStepper:
             updated = True
 
         if updated:
+            self._update_pwm_constants()
             self.logger.info("Run SAVE_SPEED_MULTIPLIER LANE={} to save values to config file".format(self.name))
 
     cmd_SAVE_SPEED_MULTIPLIER_help = "Saves fwd_speed_multiplier and rwd_speed_multiplier values to config file "
@@ -1044,16 +1426,24 @@ class AFCExtruderStepper:
         """
         self.AFC.FUNCTION.ConfigRewrite(self.fullname, 'dist_hub',  self.dist_hub, '')
 
+    def _build_status_template(self):
+        """
+        Builds dict that get_status copies from, fields that do not change after connect are filled in here and
+        the rest are placeholders so the key order stays the same as the var file
+        """
+        self._status_template = {
+            'name': self.name, 'unit': self.unit, 'hub': self.hub, 'extruder': self.extruder_name,
+            'buffer': self.buffer_name, 'buffer_status': None, 'lane': self.index, 'map': None, 'load': None,
+            'prep': None, 'tool_loaded': None, 'loaded_to_hub': None, 'material': None, 'spool_id': None,
+            'color': None, 'weight': None, 'extruder_temp': None, 'runout_lane': None, 'filament_status': None,
+            'filament_status_led': None, 'status': None,
+        }
+
     def get_status(self, eventtime=None):
-        response = {}
-        if not self.connect_done: return response
-        response['name'] = self.name
-        response['unit'] = self.unit
-        response['hub'] = self.hub
-        response['extruder'] = self.extruder_name
-        response['buffer'] = self.buffer_name
+        if not self.connect_done: return {}
+        # Returning a copy so webhooks can still diff against the previous response
+        response = self._status_template.copy()
         response['buffer_status'] = self.buffer_status()
-        response['lane'] = self.index
         response['map'] = self.map
         response['load'] = bool(self.load_state)
         response["prep"] =bool(self.prep_state)
@@ -1065,7 +1455,14 @@ class AFCExtruderStepper:
         response["weight"]=self.weight
         response["extruder_temp"] = self.extruder_temp
         response["runout_lane"]=self.runout_lane
-        filiment_stat=self.AFC.FUNCTION.get_filament_status(self).split(':')
+        # Filament status only depends on sensor states and which lane is loaded in extruder, only recalculated when
+        #  one of them changes
+        status_key = (self.prep_state, self.load_state,
+                      self.extruder_obj.lane_loaded if self.extruder_obj is not None else None)
+        if status_key != self._filament_status_key:
+            self._filament_status_key = status_key
+            self._filament_status = self.AFC.FUNCTION.get_filament_status(self).split(':')
+        filiment_stat = self._filament_status
         response['filament_status'] = filiment_stat[0]
         response['filament_status_led'] = filiment_stat[1]
         response['status'] = self.status
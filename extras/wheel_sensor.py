@@ -7,6 +7,7 @@
 """Standalone hall effect wheel sensor implementation."""
 
 from configfile import error
+from . import pulse_counter
 
 
 def load_config(config):
@@ -17,6 +18,11 @@ def load_config(config):
 class StandaloneWheelSensor:
     """Simple hall-effect based wheel RPM sensor."""
 
+    __slots__ = (
+        "printer", "reactor", "name", "pulses_per_rev", "pin", "_rpm_scale", "_freq", "_last_count",
+        "_last_count_time", "_listeners", "_stopped", "_counter",
+    )
+
     def __init__(self, config):
         self.printer = config.get_printer()
         self.reactor = self.printer.get_reactor()
@@ -25,29 +31,81 @@ class StandaloneWheelSensor:
         self.pin = config.get("pin")
         if self.pin is None:
             raise error(f"wheel_sensor {self.name}: pin must be specified")
+        # pulse_counter only accepts pullup modifiers, edge frequency does not depend on polarity so inverting is not needed
+        pin_modifiers = self.pin[:len(self.pin) - len(self.pin.lstrip("^~! "))]
+        if "!" in pin_modifiers:
+            raise error(f"wheel_sensor {self.name}: inverted pin '{self.pin}' is not supported, remove '!' from pin")
+        # converts edge frequency to rpm
+        self._rpm_scale = 60.0 / self.pulses_per_rev
+        # edges are counted on the mcu, sample_time is how often counts are reported back
+        # and poll_interval is how often the mcu checks the pin
+        sample_time = config.getfloat("sample_time", 0.1, above=0.)
+        poll_time = config.getfloat("poll_interval", 0.0015, above=0.)
+
+        # frequency from the last two counter reports, None until the second report arrives
+        self._freq = None
+        self._last_count = None
+        self._last_count_time = None
+
+        # listeners notified with rpm on every counter report while the wheel is
+        # turning and with 0 rpm once when it stops
+        self._listeners = []
+        self._stopped = True
+
+        self._counter = pulse_counter.MCU_counter(self.printer, self.pin, sample_time, poll_time)
+        self._counter.setup_callback(self._counter_callback)
 
-        # pulse counter and timestamp for rpm calculation
-        self._pulse_count = 0
-        self._prev_state = 0
-        self._last_time = self.reactor.monotonic()
+    def register_listener(self, callback):
+        """Register callback(rpm) to be called when wheel rpm updates."""
+        self._listeners.append(callback)
 
-        buttons = self.printer.load_object(config, "buttons")
-        buttons.register_buttons([self.pin], self._edge_callback)
+    def _counter_callback(self, time, count, count_time):
+        # Called from the mcu response thread, listeners are dispatched from the reactor
+        if self._last_count_time is None:
+            self._last_count_time = time
+        else:
+            delta_time = count_time - self._last_count_time
+            if delta_time > 0:
+                self._last_count_time = count_time
+                self._freq = (count - self._last_count) / delta_time
+            else:
+                # No edges seen since the last report
+                self._last_count_time = time
+                self._freq = 0.
+            if self._listeners:
+                self.reactor.register_async_callback(self._dispatch_rpm)
+        self._last_count = count
 
-    def _edge_callback(self, eventtime, state):
-        # count rising edges
-        if not self._prev_state and state:
-            self._pulse_count += 1
-        self._prev_state = state
+    def _dispatch_rpm(self, eventtime):
+        rpm = self._freq * self._rpm_scale
+        if not rpm:
+            if self._stopped:
+                return
+            self._stopped = True
+        else:
+            self._stopped = False
+        for callback in self._listeners:
+            callback(rpm)
+
+    def _sample_rpm(self):
+        """Return rpm from the latest counter report, None if no frequency has been measured yet."""
+        freq = self._freq
+        if freq is None:
+            return None
+        return freq * self._rpm_scale
 
     def get_rpm(self):
         """Return tuple of (wheel_rpm, motor_rpm)."""
-        now = self.reactor.monotonic()
-        dt = now - self._last_time
-        if dt <= 0:
-            return None, None
-        pulses = self._pulse_count
-        self._pulse_count = 0
-        self._last_time = now
-        rpm = (pulses / self.pulses_per_rev) / dt * 60.0
+        rpm = self._sample_rpm()
         return rpm, rpm
+
+    def get_rpm_into(self, out):
+        """Write (wheel_rpm, motor_rpm) into out[0] and out[1] without building a tuple.
+
+        Returns False and leaves out untouched if no rpm is available.
+        """
+        rpm = self._sample_rpm()
+        if rpm is None:
+            return False
+        out[0] = out[1] = rpm
+        return True